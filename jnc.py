@@ -198,19 +198,22 @@ class JNCPlugin(plugin.PyangPlugin):
 
         # Sweep, adding included and imported modules, until no change
         module_set = set(modules)
-        num_modules = 0
-        while num_modules != len(module_set):
-            num_modules = len(module_set)
-            for module in list(module_set):
-                imported = map(lambda x: x.arg, search(module, 'import'))
-                included = map(lambda x: x.arg, search(module, 'include'))
-                for (module_stmt, rev) in self.ctx.modules:
-                    if module_stmt in (imported + included):
-                        module_set.add(self.ctx.modules[(module_stmt, rev)])
+        unswept = list(module_set)  # Modules not yet searched for imports
+        while unswept:
+            module = unswept.pop()
+            dependencies = set(x.arg for x in search(module, 'import'))
+            dependencies.update(x.arg for x in search(module, 'include'))
+            for (module_stmt, rev) in self.ctx.modules:
+                if module_stmt in dependencies:
+                    dependency = self.ctx.modules[(module_stmt, rev)]
+                    if dependency not in module_set:
+                        module_set.add(dependency)
+                        unswept.append(dependency)
 
         # Generate files from main modules
-        for module in filter(lambda s: s.keyword == 'module', module_set):
-            self.generate_from(module)
+        for module in module_set:
+            if module.keyword == 'module':
+                self.generate_from(module)
 
         # Generate files from augmented modules
         for aug_module in augmented_modules.values():
@@ -254,17 +257,11 @@ class JNCPlugin(plugin.PyangPlugin):
             schema_nodes = ['<schema>']
             stmts = search(module, node_stmts)
             module_root = SchemaNode(module, '/')
-            schema_nodes.extend(module_root.as_list())
+            module_root.as_list(schema_nodes)
             if self.ctx.opts.verbose:
                 print('Generating schema node "/"...')
             schema_generator = SchemaGenerator(stmts, '/', self.ctx)
-            schema_nodes.extend(schema_generator.schema_nodes())
-            for i in range(1, len(schema_nodes)):
-                # Indent all but the first and last line
-                if schema_nodes[i] in ('<node>', '</node>'):
-                    schema_nodes[i] = ' ' * 4 + schema_nodes[i]
-                else:
-                    schema_nodes[i] = ' ' * 8 + schema_nodes[i]
+            schema_generator.schema_nodes(schema_nodes)
             schema_nodes.append('</schema>')
 
             name = normalize(search_one(module, 'prefix').arg)
@@ -332,58 +329,66 @@ Type '$ pyang --help' for more details on how to use pyang.
 ''')
 
 
-com_tailf_jnc = {'Attribute', 'Capabilities', 'ConfDSession',
-                 'DefaultIOSubscriber', 'Device', 'DeviceUser', 'DummyElement',
-                 'Element', 'ElementChildrenIterator', 'ElementHandler',
-                 'ElementLeafListValueIterator', 'IOSubscriber',
-                 'JNCException', 'Leaf', 'NetconfSession', 'NodeSet', 'Path',
-                 'PathCreate', 'Prefix', 'PrefixMap', 'RevisionInfo',
-                 'RpcError', 'SchemaNode', 'SchemaParser', 'SchemaTree',
-                 'SSHConnection', 'SSHSession', 'Tagpath', 'TCPConnection',
-                 'TCPSession', 'Transport', 'Utils', 'XMLParser',
-                 'YangBaseInt', 'YangBaseString', 'YangBaseType', 'YangBinary',
-                 'YangBits', 'YangBoolean', 'YangDecimal64', 'YangElement',
-                 'YangEmpty', 'YangEnumeration', 'YangException',
-                 'YangIdentityref', 'YangInt16', 'YangInt32', 'YangInt64',
-                 'YangInt8', 'YangLeafref', 'YangString', 'YangType',
-                 'YangUInt16', 'YangUInt32', 'YangUInt64', 'YangUInt8',
-                 'YangUnion', 'YangXMLParser'}
-
-
-java_reserved_words = {'abstract', 'assert', 'boolean', 'break', 'byte',
-                       'case', 'catch', 'char', 'class', 'const', 'continue',
-                       'default', 'double', 'do', 'else', 'enum', 'extends',
-                       'false','final', 'finally', 'float', 'for', 'goto',
-                       'if', 'implements', 'import', 'instanceof', 'int',
-                       'interface', 'long', 'native', 'new', 'null', 'package',
-                       'private', 'protected', 'public', 'return', 'short',
-                       'static', 'strictfp', 'super', 'switch', 'synchronized',
-                       'this', 'throw', 'throws', 'transient', 'true', 'try',
-                       'void', 'volatile', 'while'}
+com_tailf_jnc = frozenset({'Attribute', 'Capabilities', 'ConfDSession',
+                           'DefaultIOSubscriber', 'Device', 'DeviceUser',
+                           'DummyElement', 'Element',
+                           'ElementChildrenIterator', 'ElementHandler',
+                           'ElementLeafListValueIterator', 'IOSubscriber',
+                           'JNCException', 'Leaf', 'NetconfSession', 'NodeSet',
+                           'Path', 'PathCreate', 'Prefix', 'PrefixMap',
+                           'RevisionInfo', 'RpcError', 'SchemaNode',
+                           'SchemaParser', 'SchemaTree', 'SSHConnection',
+                           'SSHSession', 'Tagpath', 'TCPConnection',
+                           'TCPSession', 'Transport', 'Utils', 'XMLParser',
+                           'YangBaseInt', 'YangBaseString', 'YangBaseType',
+                           'YangBinary', 'YangBits', 'YangBoolean',
+                           'YangDecimal64', 'YangElement', 'YangEmpty',
+                           'YangEnumeration', 'YangException',
+                           'YangIdentityref', 'YangInt16', 'YangInt32',
+                           'YangInt64', 'YangInt8', 'YangLeafref',
+                           'YangString', 'YangType', 'YangUInt16',
+                           'YangUInt32', 'YangUInt64', 'YangUInt8',
+                           'YangUnion', 'YangXMLParser'})
+
+
+java_reserved_words = frozenset({'abstract', 'assert', 'boolean', 'break',
+                                 'byte', 'case', 'catch', 'char', 'class',
+                                 'const', 'continue', 'default', 'double',
+                                 'do', 'else', 'enum', 'extends', 'false',
+                                 'final', 'finally', 'float', 'for', 'goto',
+                                 'if', 'implements', 'import', 'instanceof',
+                                 'int', 'interface', 'long', 'native', 'new',
+                                 'null', 'package', 'private', 'protected',
+                                 'public', 'return', 'short', 'static',
+                                 'strictfp', 'super', 'switch', 'synchronized',
+                                 'this', 'throw', 'throws', 'transient',
+                                 'true', 'try', 'void', 'volatile', 'while'})
 """A set of all identifiers that are reserved in Java"""
 
 
-java_literals = {'true', 'false', 'null'}
+java_literals = frozenset({'true', 'false', 'null'})
 """The boolean and null literals of Java"""
 
 
-java_lang = {'Appendable', 'CharSequence', 'Cloneable', 'Comparable',
-             'Iterable', 'Readable', 'Runnable', 'Boolean', 'Byte',
-             'Character', 'Class', 'ClassLoader', 'Compiler', 'Double',
-             'Enum', 'Float', 'Integer', 'Long', 'Math', 'Number',
-             'Object', 'Package', 'Process', 'ProcessBuilder',
-             'Runtime', 'RuntimePermission', 'SecurityManager',
-             'Short', 'StackTraceElement', 'StrictMath', 'String',
-             'StringBuffer', 'StringBuilder', 'System', 'Thread',
-             'ThreadGroup', 'ThreadLocal', 'Throwable', 'Void'}
+java_lang = frozenset({'Appendable', 'CharSequence', 'Cloneable', 'Comparable',
+                       'Iterable', 'Readable', 'Runnable', 'Boolean', 'Byte',
+                       'Character', 'Class', 'ClassLoader', 'Compiler',
+                       'Double', 'Enum', 'Float', 'Integer', 'Long', 'Math',
+                       'Number', 'Object', 'Package', 'Process',
+                       'ProcessBuilder', 'Runtime', 'RuntimePermission',
+                       'SecurityManager', 'Short', 'StackTraceElement',
+                       'StrictMath', 'String', 'StringBuffer', 'StringBuilder',
+                       'System', 'Thread', 'ThreadGroup', 'ThreadLocal',
+                       'Throwable', 'Void'})
 """A subset of the java.lang classes"""
 
 
-java_util = {'Collection', 'Enumeration', 'Iterator', 'List', 'ListIterator',
-             'Map', 'Queue', 'Set', 'ArrayList', 'Arrays', 'HashMap',
-             'HashSet', 'Hashtable', 'LinkedList', 'Properties', 'Random',
-             'Scanner', 'Stack', 'StringTokenizer', 'Timer', 'TreeMap',
-             'TreeSet', 'UUID', 'Vector'}
+java_util = frozenset({'Collection', 'Enumeration', 'Iterator', 'List',
+                       'ListIterator', 'Map', 'Queue', 'Set', 'ArrayList',
+                       'Arrays', 'HashMap', 'HashSet', 'Hashtable',
+                       'LinkedList', 'Properties', 'Random', 'Scanner',
+                       'Stack', 'StringTokenizer', 'Timer', 'TreeMap',
+                       'TreeSet', 'UUID', 'Vector'})
 """A subset of the java.util interfaces and classes"""
 
 
@@ -391,15 +396,15 @@ java_built_in = java_reserved_words | java_literals | java_lang
 """Identifiers that shouldn't be imported in Java"""
 
 
-yangelement_stmts = {'container', 'list', 'notification'}
+yangelement_stmts = frozenset({'container', 'list', 'notification'})
 """Keywords of statements that YangElement classes are generated from"""
 
 
-leaf_stmts = {'leaf', 'leaf-list'}
+leaf_stmts = frozenset({'leaf', 'leaf-list'})
 """Leaf and leaf-list statement keywords"""
 
 
-module_stmts = {'module', 'submodule'}
+module_stmts = frozenset({'module', 'submodule'})
 """Module and submodule statement keywords"""
 
 
@@ -407,6 +412,36 @@ node_stmts = module_stmts | yangelement_stmts | leaf_stmts
 """Keywords of statements that make up a configuration tree"""
 
 
+on_demand_imports = ('com.tailf.jnc.*', 'java.math.*', 'java.util.*')
+"""Packages imported by all classes when import-on-demand is enabled"""
+
+
+mark_ops = ('replace', 'merge', 'create', 'delete')
+"""Operations for which mark methods are generated, in order of generation"""
+
+
+builtin_types = {
+    'string': ('com.tailf.jnc.YangString', 'String'),
+    'boolean': ('com.tailf.jnc.YangBoolean', 'Boolean'),
+    'enumeration': ('com.tailf.jnc.YangEnumeration', 'String'),
+    'binary': ('com.tailf.jnc.YangBinary', 'String'),
+    'union': ('com.tailf.jnc.YangUnion', 'String'),
+    'empty': ('com.tailf.jnc.YangEmpty', 'String'),
+    'instance-identifier': ('com.tailf.jnc.YangInstanceIdentifier', 'String'),
+    'identityref': ('com.tailf.jnc.YangIdentityref', 'String'),
+    'bits': ('com.tailf.jnc.YangBits', 'BigInteger'),
+    'decimal64': ('com.tailf.jnc.YangDecimal64', 'BigDecimal'),
+    'int8': ('com.tailf.jnc.YangInt8', 'byte'),
+    'int16': ('com.tailf.jnc.YangInt16', 'short'),
+    'int32': ('com.tailf.jnc.YangInt32', 'int'),
+    'int64': ('com.tailf.jnc.YangInt64', 'long'),
+    'uint8': ('com.tailf.jnc.YangUInt8', 'short'),
+    'uint16': ('com.tailf.jnc.YangUInt16', 'int'),
+    'uint32': ('com.tailf.jnc.YangUInt32', 'long'),
+    'uint64': ('com.tailf.jnc.YangUInt64', 'BigInteger')}
+"""Maps built-in YANG types (except leafref) to jnc and primitive types"""
+
+
 package_info = '''/**
  * This class hierarchy was generated from the Yang module{0}
  * by the <a target="_top" href="https://github.com/tail-f-systems/JNC">JNC</a> plugin of <a target="_top" href="http://code.google.com/p/pyang/">pyang</a>.
@@ -422,12 +457,24 @@ package_info = '''/**
  * @see <a target="_top" href="ftp://ftp.rfc-editor.org/in-notes/rfc6242.txt">RFC 6242: Using the NETCONF Protocol over Secure Shell (SSH)</a>
  * @see <a target="_top" href="http://www.tail-f.com">Tail-f Systems</a>
  */
- package '''
+ package {2};'''
 """Format string used in package-info files"""
 
 
-outputted_warnings = []
-"""A list of warning message IDs that are used to avoid duplicate warnings"""
+generation_date = date.today()
+"""Date on which the Java files are generated"""
+
+
+file_date = generation_date.strftime('%d/%m/%y')
+"""generation_date as shown on the first line of generated Java files"""
+
+
+version_date = generation_date.isoformat()
+"""generation_date as shown in the javadoc version tag of generated classes"""
+
+
+outputted_warnings = set([])
+"""A set of warning message IDs that are used to avoid duplicate warnings"""
 
 
 augmented_modules = {}
@@ -442,10 +489,30 @@ normalized_stmt_args = {}
 """Cache containing normalized versions of statement identifiers"""
 
 
+searched_stmts = {}
+"""Cache containing results of search_one, keyed by its arguments"""
+
+
+stmt_packages = {}
+"""Cache containing package names of classes generated from statements"""
+
+
+stmt_types = {}
+"""Cache containing jnc and primitive types of statements"""
+
+
+module_namespaces = {}
+"""Cache containing namespaces of modules, keyed by module statement"""
+
+
 class_hierarchy = {}
 """Dict that map package names to sets of names of classes to be generated"""
 
 
+leading_digit = re.compile(r'\d')
+"""Matches identifiers that need an underline prepended to be valid in Java"""
+
+
 def print_warning(msg='', key='', ctx=None):
     """Prints msg to stderr if ctx is None or the debug or verbose flags are
     set in context ctx and key is empty or not in outputted_warnings. If key is
@@ -458,7 +525,7 @@ def print_warning(msg='', key='', ctx=None):
         if msg:
             sys.stderr.write('WARNING: ' + msg)
             if key:
-                outputted_warnings.append(key)
+                outputted_warnings.add(key)
         else:
             print_warning(('No support for type "' + key + '", defaulting ' +
                 'to string.'), key, ctx)
@@ -470,34 +537,24 @@ def write_file(d, file_name, file_content, ctx):
 
     """
     d = d.replace('.', os.sep)
-    wd = os.getcwd()
+    path = d + os.sep + file_name
     try:
         os.makedirs(d, 0o777)
     except OSError as exc:
-        if exc.errno == errno.EEXIST:
-            pass  # The directory already exists
-        else:
-            raise
-    try:
-        os.chdir(d)
-    except OSError as exc:
-        if exc.errno == errno.ENOTDIR:
-            print_warning(msg=('Unable to change directory to ' + d +
+        if exc.errno == errno.ENOTDIR or (exc.errno == errno.EEXIST
+                                          and not os.path.isdir(d)):
+            print_warning(msg=('Unable to create directory ' + d +
                 '. Probably a non-directory file with same name as one of ' +
                 'the subdirectories already exists.'), key=d, ctx=ctx)
-        else:
+        elif exc.errno != errno.EEXIST:
             raise
-    finally:
-        if ctx.opts.verbose:
-            print('Writing file to: ' + os.getcwd() + os.sep + file_name)
-        os.chdir(wd)
-    with open(d + os.sep + file_name, 'w+') as f:
+    if ctx.opts.verbose:
+        print('Writing file to: ' + os.path.abspath(path))
+    with open(path, 'w+') as f:
         if isinstance(file_content, str):
             f.write(file_content)
         else:
-            for line in file_content:
-                f.write(line)
-                f.write('\n')
+            f.writelines(line + '\n' for line in file_content)
 
 
 def get_module(stmt):
@@ -536,6 +593,11 @@ def get_package(stmt, ctx):
     from stmt, assuming that it has been or will be generated by JNC.
 
     """
+    key = (stmt, ctx.rootpkg)  # stmt is reassigned below
+    try:  # Fetch from cache
+        return stmt_packages[key]
+    except KeyError:
+        pass
     sub_packages = collections.deque()
     parent = get_parent(stmt)
     while parent is not None:
@@ -544,17 +606,9 @@ def get_package(stmt, ctx):
         sub_packages.appendleft(camelize(stmt.arg))
     full_package = ctx.rootpkg.split(os.sep)
     full_package.extend(sub_packages)
-    return '.'.join(full_package)
-
-
-def pairwise(iterable):
-    """Returns an iterator that includes the next item also"""
-    iterator = iter(iterable)
-    item = next(iterator)  # throws StopIteration if empty.
-    for next_item in iterator:
-        yield (item, next_item)
-        item = next_item
-    yield (item, None)
+    res = '.'.join(full_package)
+    stmt_packages[key] = res  # Add to cache
+    return res
 
 
 def capitalize_first(string):
@@ -585,30 +639,33 @@ def camelize(string):
     except KeyError:
         pass
     camelized_str = collections.deque()
-    if string is not None:
-        iterator = pairwise(decapitalize_first(string))
-        for character, next_character in iterator:
-            if next_character is None:
-                if (len(string) > 1):
-                    camelized_str.append(character)
-                else:
-                    if(string.isupper()):
-                        camelized_str.append(character.upper())
-                    else:
-                        camelized_str.append(character.lower())
+    if string:
+        decapitalized = decapitalize_first(string)
+        skip = False  # True if next character is consumed by a hyphen or dot
+        for character, next_character in zip(decapitalized, decapitalized[1:]):
+            if skip:
+                skip = False
             elif character in '-.':
                 camelized_str.append(capitalize_first(next_character))
-                next(iterator)
+                skip = True
             elif (character.isupper()
                   and (next_character.isupper()
                        or not next_character.isalpha())):
                 camelized_str.append(character.lower())
             else:
                 camelized_str.append(character)
+        if not skip:
+            character = decapitalized[-1]
+            if len(string) > 1:
+                camelized_str.append(character)
+            elif string.isupper():
+                camelized_str.append(character.upper())
+            else:
+                camelized_str.append(character.lower())
     res = ''.join(camelized_str)
-    if res in java_reserved_words | java_literals:
+    if res in java_reserved_words or res in java_literals:
         camelized_str.append('_')
-    if re.match(r'\d', res):
+    if leading_digit.match(res):
         camelized_str.appendleft('_')
     res = ''.join(camelized_str)
     camelized_stmt_args[string] = res  # Add to cache
@@ -636,15 +693,19 @@ def normalize(string):
     return res
 
 
-def flatten(l):
+def flatten(l, res=None):
     """Returns a flattened version of iterable l
 
     l must not have an attribute named values unless the return value values()
     is a valid substitution of l. Same applies to all items in l.
 
+    res -- If supplied, the items are appended to this list, which is also
+           used for the items of any nested iterables.
+
     Example: flatten([['12', '34'], ['56', ['7']]]) = ['12', '34', '56', '7']
     """
-    res = []
+    if res is None:
+        res = []
     while hasattr(l, 'values'):
         l = list(l.values())
     for item in l:
@@ -654,7 +715,7 @@ def flatten(l):
         except (AssertionError, TypeError):
             res.append(item)
         else:
-            res.extend(flatten(item))
+            flatten(item, res)
     return res
 
 
@@ -663,61 +724,79 @@ def get_types(yang_type, ctx):
     typedef, leaf or leaf-list statement.
 
     """
+    key = (yang_type, ctx.rootpkg)  # yang_type is reassigned below
+    try:  # Fetch from cache
+        return stmt_types[key]
+    except KeyError:
+        pass
     if yang_type.keyword in leaf_stmts:
         yang_type = search_one(yang_type, 'type')
     assert yang_type.keyword in ('type', 'typedef'), 'argument is type, typedef or leaf'
     if yang_type.arg == 'leafref':
-        return get_types(yang_type.parent.i_leafref.i_target_node, ctx)
+        res = get_types(yang_type.parent.i_leafref.i_target_node, ctx)
+    elif yang_type.arg in builtin_types:
+        res = builtin_types[yang_type.arg]
+    else:
+        res = get_derived_types(yang_type, ctx)
+    stmt_types[key] = res  # Add to cache
+    return res
+
+
+def get_derived_types(yang_type, ctx):
+    """Returns jnc and primitive counterparts of yang_type, which is a type or
+    typedef statement that does not refer to a built-in type or a leafref.
+
+    """
     primitive = normalize(yang_type.arg)
     if yang_type.keyword == 'typedef':
         primitive = normalize(get_base_type(yang_type).arg)
     if primitive == 'JBoolean':
         primitive = 'Boolean'
     jnc = 'com.tailf.jnc.Yang' + primitive
-    if yang_type.arg in ('string', 'boolean'):
-        pass
-    elif yang_type.arg in ('enumeration', 'binary', 'union', 'empty',
-                           'instance-identifier', 'identityref'):
-        primitive = 'String'
-    elif yang_type.arg in ('bits',):  # uint64 handled below
-        primitive = 'BigInteger'
-    elif yang_type.arg == 'decimal64':
-        primitive = 'BigDecimal'
-    elif yang_type.arg in ('int8', 'int16', 'int32', 'int64', 'uint8',
-            'uint16', 'uint32', 'uint64'):
-        integer_type = ['long', 'int', 'short', 'byte']
-        if yang_type.arg[:1] == 'u':  # Unsigned
-            integer_type.pop()
-            integer_type.insert(0, 'BigInteger')
-            jnc = 'com.tailf.jnc.YangUI' + yang_type.arg[2:]
-        if yang_type.arg[-2:] == '64':
-            primitive = integer_type[0]
-        elif yang_type.arg[-2:] == '32':
-            primitive = integer_type[1]
-        elif yang_type.arg[-2:] == '16':
-            primitive = integer_type[2]
-        else:  # 8 bits
-            primitive = integer_type[3]
-    else:
-        try:
-            typedef = yang_type.i_typedef
-        except AttributeError:
-            if yang_type.keyword == 'typedef':
-                primitive = normalize(yang_type.arg)
-            else:
-                pkg = get_package(yang_type, ctx)
-                name = normalize(yang_type.arg)
-                print_warning(key=pkg  + '.' + name, ctx=ctx)
+    try:
+        typedef = yang_type.i_typedef
+    except AttributeError:
+        if yang_type.keyword == 'typedef':
+            primitive = normalize(yang_type.arg)
         else:
-            basetype = get_base_type(typedef)
-            jnc, primitive = get_types(basetype, ctx)
-            if get_parent(typedef).keyword in ('module', 'submodule'):
-                package = get_package(typedef, ctx)
-                typedef_arg = normalize(typedef.arg)
-                jnc = package + '.' + typedef_arg
+            pkg = get_package(yang_type, ctx)
+            name = normalize(yang_type.arg)
+            print_warning(key=pkg  + '.' + name, ctx=ctx)
+    else:
+        basetype = get_base_type(typedef)
+        jnc, primitive = get_types(basetype, ctx)
+        if get_parent(typedef).keyword in ('module', 'submodule'):
+            package = get_package(typedef, ctx)
+            typedef_arg = normalize(typedef.arg)
+            jnc = package + '.' + typedef_arg
     return jnc, primitive
 
 
+def bits_arguments(type_stmt, indent):
+    """Returns the lines with the mask, bit names and bit positions of the
+    bits type type_stmt, as passed to the constructor of YangBits.
+
+    indent -- String prepended to each of the returned lines
+
+    """
+    mask = 0
+    names = [indent, 'new String[] {']
+    positions = [indent, 'new int[] {']
+    position = 0
+    for bit in search(type_stmt, 'bit'):
+        names.extend(['"', bit.arg, '", '])
+        pos_stmt = search_one(bit, 'position')
+        if pos_stmt:
+            position = int(pos_stmt.arg)
+        positions.extend([str(position), ', '])
+        mask += 1 << position
+        position += 1
+    names.append('},')
+    positions.append('}')
+    return [''.join([indent, 'new BigInteger("', str(mask), '"),']),
+            ''.join(names), ''.join(positions)]
+
+
 def get_base_type(stmt):
     """Returns the built in type that stmt is derived from"""
     if stmt.keyword == 'type' and stmt.arg == 'union':
@@ -807,6 +886,10 @@ def search(stmt, keywords):
 
 def search_one(stmt, keyword, arg=None):
     """Utility for calling Statement.search_one, including i_children."""
+    try:  # Fetch from cache
+        return searched_stmts[(stmt, keyword, arg)]
+    except KeyError:
+        pass
     res = stmt.search_one(keyword, arg=arg)
     if res is None:
         try:
@@ -815,9 +898,10 @@ def search_one(stmt, keyword, arg=None):
             pass
     if res is None:
         try:
-            return search(stmt, keyword)[0]
+            res = search(stmt, keyword)[0]
         except IndexError:
-            return None
+            pass
+    searched_stmts[(stmt, keyword, arg)] = res  # Add to cache
     return res
 
 
@@ -838,23 +922,37 @@ class SchemaNode(object):
         self.stmt = stmt
         self.tagpath = tagpath
 
-    def as_list(self):
-        """Returns a string list repr "node" element content for an XML schema"""
-        res = ['<node>']
+    def as_list(self, res=None):
+        """Returns a string list repr "node" element content for an XML schema
+
+        The lines are indented for placement within a "schema" element.
+
+        res -- If supplied, the lines are appended to this list, which is
+               returned instead of a new list.
+
+        """
+        if res is None:
+            res = []
+        indent = ' ' * 8
+        res.append('    <node>')
         stmt = self.stmt
-        res.append('<tagpath>' + self.tagpath + '</tagpath>')
+        res.append(indent + '<tagpath>' + self.tagpath + '</tagpath>')
         top_stmt = get_module(stmt)
-        if top_stmt.keyword == 'module':
-            module = top_stmt
-        else:  #submodule
-            modulename = search_one(top_stmt, 'belongs-to').arg
-            for (name, rev) in top_stmt.i_ctx.modules:
-                if name == modulename:
-                    module = top_stmt.i_ctx.modules[(name, rev)]
-                    break
-        ns = search_one(module, 'namespace').arg
-        res.append('<namespace>' + ns + '</namespace>')
-        res.append('<primitive_type>0</primitive_type>')
+        try:  # Fetch from cache
+            ns = module_namespaces[top_stmt]
+        except KeyError:
+            if top_stmt.keyword == 'module':
+                module = top_stmt
+            else:  #submodule
+                modulename = search_one(top_stmt, 'belongs-to').arg
+                for (name, rev) in top_stmt.i_ctx.modules:
+                    if name == modulename:
+                        module = top_stmt.i_ctx.modules[(name, rev)]
+                        break
+            ns = search_one(module, 'namespace').arg
+            module_namespaces[top_stmt] = ns  # Add to cache
+        res.append(indent + '<namespace>' + ns + '</namespace>')
+        res.append(indent + '<primitive_type>0</primitive_type>')
 
         min_occurs = '0'
         max_occurs = '-1'
@@ -880,17 +978,16 @@ class SchemaNode(object):
         if (isUnique or childOfContainerOrList
                 or stmt.keyword in ('container', 'notification')):
             max_occurs = '1'
-        res.append('<min_occurs>' + min_occurs + '</min_occurs>')
-        res.append('<max_occurs>' + max_occurs + '</max_occurs>')
+        res.append(indent + '<min_occurs>' + min_occurs + '</min_occurs>')
+        res.append(indent + '<max_occurs>' + max_occurs + '</max_occurs>')
 
-        children = ''
-        for ch in search(stmt, yangelement_stmts | leaf_stmts):
-            children += camelize(ch.arg) + ' '
-        res.append('<children>' + children[:-1] + '</children>')
+        children = ' '.join(camelize(ch.arg) for ch in
+                            search(stmt, yangelement_stmts | leaf_stmts))
+        res.append(indent + '<children>' + children + '</children>')
 
-        res.append('<flags>0</flags>')
-        res.append('<desc></desc>')
-        res.append('</node>')
+        res.append(indent + '<flags>0</flags>')
+        res.append(indent + '<desc></desc>')
+        res.append('    </node>')
         return res
 
 
@@ -902,18 +999,25 @@ class SchemaGenerator(object):
         self.tagpath = tagpath
         self.ctx = ctx
 
-    def schema_nodes(self):
-        """Generate XML schema as a list of "node" elements"""
-        res = []
+    def schema_nodes(self, res=None):
+        """Generate XML schema as a list of "node" elements
+
+        res -- If supplied, the "node" elements are appended to this list,
+               which is also used for the elements of any substatements.
+
+        """
+        if res is None:
+            res = []
+        verbose = self.ctx.opts.verbose
         for stmt in self.stmts:
             subpath = self.tagpath + stmt.arg + '/'
-            if self.ctx.opts.verbose:
-                print('Generating schema node "' + subpath + '"...')
+            if verbose:
+                print('Generating schema node "%s"...' % subpath)
             node = SchemaNode(stmt, subpath)
-            res.extend(node.as_list())
+            node.as_list(res)
             substmt_generator = SchemaGenerator(search(stmt, node_stmts),
                 subpath, self.ctx)
-            res.extend(substmt_generator.schema_nodes())
+            substmt_generator.schema_nodes(res)
         return res
 
 
@@ -1023,7 +1127,7 @@ class ClassGenerator(object):
         # Gather typedefs to generate and add to class_hierarchy dict
         typedef_stmts = set([])
         module_stmts = set([self.stmt])
-        included = map(lambda x: x.arg, search(self.stmt, 'include'))
+        included = set(x.arg for x in search(self.stmt, 'include'))
         for (module, rev) in self.ctx.modules:
             if module in included:
                 module_stmts.add(self.ctx.modules[(module, rev)])
@@ -1043,6 +1147,7 @@ class ClassGenerator(object):
                     pass
 
         # Generate the typedef classes
+        verbose = self.ctx.opts.verbose
         for stmt in typedef_stmts:
             name = normalize(stmt.arg)
             description = ''.join(['This class represents an element from ',
@@ -1057,8 +1162,8 @@ class ClassGenerator(object):
                                         description=description,
                                         source=self.src,
                                         superclass='YangElement')
-            if self.ctx.opts.verbose:
-                print('Generating Java class "' + name + '.java' + '"...')
+            if verbose:
+                print('Generating Java class "%s.java"...' % name)
 
             gen = MethodGenerator(stmt, self.ctx)
 
@@ -1096,10 +1201,11 @@ class ClassGenerator(object):
         if self.ctx.opts.verbose:
             print('Generating Java class "' + self.filename + '"...')
         self.java_class = JavaClass(filename=self.filename,
-                package=self.package, description=('The root class for namespace ' +
-                    ns_arg + ' (accessible from \n * ' + self.n +
-                    '.NAMESPACE) with prefix "' + prefix.arg + '" (' + self.n +
-                    '.PREFIX).'),
+                package=self.package, description=''.join([
+                    'The root class for namespace ', ns_arg,
+                    ' (accessible from \n * ', self.n,
+                    '.NAMESPACE) with prefix "', prefix.arg, '" (', self.n,
+                    '.PREFIX).']),
                 source=self.src)
 
         # Set fields in root class
@@ -1123,7 +1229,8 @@ class ClassGenerator(object):
         enabler.add_line('"'.join(['YangElement.setPackage(NAMESPACE, ',
                                    self.java_class.package, ');']))
         enabler.add_dependency('com.tailf.jnc.YangElement')
-        enabler.add_line(normalize(prefix.arg) + '.registerSchema();')
+        prefix_name = normalize(prefix.arg)
+        enabler.add_line(prefix_name + '.registerSchema();')
         self.java_class.add_enabler(enabler)
 
         # Add method 'registerSchema' to root class
@@ -1142,9 +1249,10 @@ class ClassGenerator(object):
         reg.add_dependency('com.tailf.jnc.SchemaNode')
         reg.add_dependency('com.tailf.jnc.SchemaTree')
         schema = os.sep.join([self.ctx.opts.directory.replace('.', os.sep),
-                              self.n2, normalize(prefix.arg)])
+                              self.n2, prefix_name])
         if self.ctx.opts.classpath_schema_loading:
-            reg.add_line('parser.findAndReadFile("' + normalize(prefix.arg) + '.schema", h, ' + normalize(prefix.arg) + '.class);')
+            reg.add_line(''.join(['parser.findAndReadFile("', prefix_name,
+                                  '.schema", h, ', prefix_name, '.class);']))
         else:
             reg.add_line('parser.readFile("' + schema + '.schema", h);')
         self.java_class.add_schema_registrator(reg)
@@ -1186,7 +1294,9 @@ class ClassGenerator(object):
                 source=self.src,
                 superclass='YangElement')
 
-        for ch in search(stmt, yangelement_stmts | leaf_stmts):
+        gen = MethodGenerator(stmt, self.ctx)
+
+        for ch in gen.child_stmts:
             field = self.generate_child(ch)
             ch_arg = normalize(ch.arg)
             if field is not None:
@@ -1216,8 +1326,6 @@ class ClassGenerator(object):
             if self.ctx.opts.verbose:
                 print('Generating "' + self.filename + '"...')
 
-        gen = MethodGenerator(stmt, self.ctx)
-
         for constructor in gen.constructors():
             self.java_class.add_constructor(constructor)
 
@@ -1232,9 +1340,8 @@ class ClassGenerator(object):
         self.java_class.add_name_getter(gen.children_names())
 
         if self.ctx.opts.import_on_demand:
-            self.java_class.imports.add('com.tailf.jnc.*')
-            self.java_class.imports.add('java.math.*')
-            self.java_class.imports.add('java.util.*')
+            for import_ in on_demand_imports:
+                self.java_class.imports.add(import_)
             if self.rootpkg != self.package:
                 self.java_class.imports.add(self.rootpkg + '.*')
                 top = get_module(self.stmt)
@@ -1278,13 +1385,13 @@ class ClassGenerator(object):
                 self.java_class.add_field(child_gen.child_field())
             else:
                 field = ''
+            name = normalize(sub.arg)
+            f_name = '.'.join([pkg, name])
+            def f(s):
+                res = s.replace(name, f_name)
+                res = res.replace('add' + f_name, 'add' + name)
+                return res
             for access_method in child_gen.parent_access_methods():
-                name = normalize(sub.arg)
-                def f(s):
-                    f_name = '.'.join([pkg, name])
-                    res = s.replace(name, f_name)
-                    res = res.replace('add' + f_name, 'add' + name)
-                    return res
                 if (name == self.n and isinstance(access_method, JavaMethod)):
                     access_method.return_type = f(access_method.return_type)
                     access_method.parameters = [f(x) for x in access_method.parameters]
@@ -1314,7 +1421,6 @@ class ClassGenerator(object):
                 add(sub.arg, child_gen.adders())
                 optional = True
             if optional:
-                child_gen = MethodGenerator(sub, self.ctx)
                 for mark_method in child_gen.markers():
                     add(sub.arg, mark_method)
         return field
@@ -1351,23 +1457,25 @@ class PackageInfoGenerator(object):
         """
         write_file(self.d, 'package-info.java',
                    self.gen_package_info(), self.ctx)
-        dirs = filter(lambda s: not s.endswith('.java'), os.listdir(self.d))
-        stmts = search(self.stmt, node_stmts)
-        for directory in dirs:
-            for sub in stmts:
-                if normalize(sub.arg) == normalize(directory):
-                    old_d = self.d
-                    self.d += os.sep + directory
-                    old_pkg = self.pkg
-                    self.pkg += '.' + directory
-                    old_stmt = self.stmt
-                    self.stmt = sub
-
-                    self.generate_package_info()
-
-                    self.d = old_d
-                    self.pkg = old_pkg
-                    self.stmt = old_stmt
+        stmts = {}  # Maps normalized identifiers to substatements
+        for sub in search(self.stmt, node_stmts):
+            stmts.setdefault(normalize(sub.arg), []).append(sub)
+        for directory in os.listdir(self.d):
+            if directory.endswith('.java'):
+                continue
+            for sub in stmts.get(normalize(directory), ()):
+                old_d = self.d
+                self.d += os.sep + directory
+                old_pkg = self.pkg
+                self.pkg += '.' + directory
+                old_stmt = self.stmt
+                self.stmt = sub
+
+                self.generate_package_info()
+
+                self.d = old_d
+                self.pkg = old_pkg
+                self.stmt = old_stmt
 
     def gen_package_info(self):
         """Writes a package-info.java file to the package directory with a high
@@ -1375,7 +1483,7 @@ class PackageInfoGenerator(object):
 
         """
         module = get_module(self.stmt).arg
-        return ''.join([package_info.format(' ' + module, ''), self.pkg, ';'])
+        return package_info.format(' ' + module, '', self.pkg)
 
 
 class JavaClass(object):
@@ -1399,7 +1507,7 @@ class JavaClass(object):
                        displayed in a Java comment in the beginning of the code.
         package     -- Should be just the name of the package in which the class
                        will be included.
-        imports     -- Should be a list of names of imported libraries.
+        imports     -- An iterable with names of imported libraries, or None.
         description -- Defines the class semantics.
         body        -- Should contain the actual code of the class if it is not
                        supplied through the add-methods
@@ -1409,13 +1517,9 @@ class JavaClass(object):
         source      -- A string somehow representing the origin of the class
 
         """
-        if imports is None:
-            imports = []
         self.filename = filename
         self.package = package if package[:3] != 'src' else package[4:]
-        self.imports = OrderedSet()
-        for i in range(len(imports)):
-            self.imports.add(imports[i])
+        self.imports = OrderedSet(imports)
         self.description = description
         self.body = body
         self.version = version
@@ -1482,17 +1586,23 @@ class JavaClass(object):
         """Adds a support method represented as a string"""
         self.support_methods.add(support_method)
 
-    def get_body(self):
+    def get_body(self, methods=None):
         """Returns self.body. If it is None, fields and methods are added to it
-        before it is returned."""
+        before it is returned.
+
+        methods -- If supplied, used instead of flattening self.attrs again.
+
+        """
         if self.body is None:
+            if methods is None:
+                methods = flatten(self.attrs)
             self.body = []
             if self.superclass is not None or 'Serializable' in self.interfaces:
                 self.body.extend(JavaValue(
                     modifiers=['private', 'static', 'final', 'long'],
                     name='serialVersionUID', value='1L').as_list())
                 self.body.append('')
-            for method in flatten(self.attrs):
+            for method in methods:
                 if hasattr(method, 'as_list'):
                     self.body.extend(method.as_list())
                 else:
@@ -1525,7 +1635,7 @@ class JavaClass(object):
         """
         # The header is placed in the beginning of the Java file
         header = [' '.join(['/* \n * @(#)' + self.filename, '      ',
-                            self.version, date.today().strftime('%d/%m/%y')])]
+                            self.version, file_date])]
         header.append(' *')
         header.append(' * This file has been auto-generated by JNC, the')
         header.append(' * Java output format plug-in of pyang.')
@@ -1535,26 +1645,29 @@ class JavaClass(object):
         # package and import statement goes here
         header.append('')
         header.append('package ' + self.package + ';')
+        methods = None
         if self.body is None:
-            for method in flatten(self.attrs):
+            methods = flatten(self.attrs)
+            for method in methods:
                 if hasattr(method, 'imports'):
                     self.imports |= method.imports
                 if hasattr(method, 'exceptions'):
                     self.imports |= ['com.tailf.jnc.' + s for s in method.exceptions]
         if self.superclass:
             self.imports.add(get_import(self.superclass))
-        imported_classes = []
+        class_name = self.filename.split('.')[0]
+        imported_classes = set([])
         if self.imports:
             prevpkg = ''
             for import_ in self.imports.as_sorted_list():
                 pkg, _, cls = import_.rpartition('.')
-                if (cls != self.filename.split('.')[0]
+                if (cls != class_name
                         and (pkg != 'com.tailf.jnc' or cls in com_tailf_jnc
                             or cls == '*')):
                     if cls in imported_classes:
                         continue
                     else:
-                        imported_classes.append(cls)
+                        imported_classes.add(cls)
                     basepkg = import_[:import_.find('.')]
                     if basepkg != prevpkg:
                         header.append('')
@@ -1568,15 +1681,15 @@ class JavaClass(object):
         header.append(' *')
         header.append(' '.join([' * @version',
                                 self.version,
-                                date.today().isoformat()]))
+                                version_date]))
         header.append(' * @author Auto Generated')
         header.append(' */')
         header.append(''.join(['public class ',
-                               self.filename.split('.')[0],
+                               class_name,
                                self.get_superclass_and_interfaces(),
                                ' {']))
         header.append('')
-        return header + self.get_body()
+        return header + self.get_body(methods)
 
 
 class JavaValue(object):
@@ -1639,8 +1752,7 @@ class JavaValue(object):
 
         self.imports = set([])
         if imports is not None:
-            for import_ in imports:
-                self.imports.add(import_)
+            self.imports.update(imports)
 
         self.exact = exact
         self.default_modifiers = True
@@ -1725,7 +1837,8 @@ class JavaValue(object):
         lines = []
         if self.javadocs:
             lines.append(self.indent + '/**')
-            lines.extend([self.indent + ' * ' + line for line in self.javadocs])
+            prefix = self.indent + ' * '
+            lines.extend([prefix + line for line in self.javadocs])
             lines.append(self.indent + ' */')
         return lines
 
@@ -1835,7 +1948,7 @@ class JavaMethod(JavaValue):
 
     def add_line(self, line):
         """Adds line to method body"""
-        self._set_instance_data('body', self.indent + ' ' * 4 + line)
+        self._set_instance_data('body', self.indent + '    ' + line)
 
     def as_list(self):
         """String list of code lines that this Java method consists of.
@@ -1859,7 +1972,7 @@ class JavaMethod(JavaValue):
             if self.exceptions:
                 signature.append(' throws ')
                 signature.append(', '.join(self.exceptions))
-                if sum(len(s) for s in signature) >= MAX_COLS:
+                if sum(map(len, signature)) >= MAX_COLS:
                     signature.insert(-2, '\n' + (self.indent * 3)[:-1])
             signature.append(' {')
             self.exact.append(''.join(signature))
@@ -1876,8 +1989,8 @@ class MethodGenerator(object):
         self.stmt = stmt
         self.n = normalize(stmt.arg)
         self.n2 = camelize(stmt.arg)
-        self.children = [normalize(s.arg) for s in
-                         search(stmt, yangelement_stmts | leaf_stmts)]
+        self.child_stmts = search(stmt, yangelement_stmts | leaf_stmts)
+        self.children = [normalize(s.arg) for s in self.child_stmts]
 
         self.ctx = ctx
         self.module_stmt = get_module(stmt)
@@ -1957,7 +2070,7 @@ class MethodGenerator(object):
                 res.add(dependency)
                 continue
             elif dependency.endswith('>'):
-                for token in [_f for _f in re.findall(r'\w+', dependency) if _f]:
+                for token in re.findall(r'\w+', dependency):
                     res.add(self.canonical_import(token, child))
             elif dependency.endswith(']'):
                 assert dependency[:-2] and dependency[-2:] == '[]'
@@ -2036,22 +2149,25 @@ class MethodGenerator(object):
                 getter_calls.append(''.join(['get', normalize(key_stmt.arg),
                                              'Value().toString()']))
             keys = ', '.join(getter_calls)
+        copy = ''.join(['new ', self.n, '(', keys, ')'])
+        keyed_copy = self.is_list and self.gen.is_config
         for i, cloner in enumerate(cloners):
             cloner.add_javadoc('Clones this object, returning' + a[i] + 'copy.')
             cloner.add_javadoc('@return A clone of the object.' + b[i])
             cloner.return_type = self.n
             cloner.set_name('clone' + c[i])
-            copy = ''.join(['new ', self.n, '(', keys, ')'])
-            if self.is_list and self.gen.is_config:
+            if keyed_copy:
                 cloner.add_line(self.n + ' copy;')
                 cloner.add_line('try {')
                 cloner.add_line('    copy = ' + copy + ';')
                 cloner.add_line('} catch (JNCException e) {')
                 cloner.add_line('    copy = null;')
                 cloner.add_line('}')
-                copy = 'copy'
-            cloner.add_line(''.join(['return (', self.n, ')clone', c[i],
-                                     'Content(', copy, ');']))
+                cloner.add_line(''.join(['return (', self.n, ')clone', c[i],
+                                         'Content(copy);']))
+            else:
+                cloner.add_line(''.join(['return (', self.n, ')clone', c[i],
+                                         'Content(', copy, ');']))
             cloner = self.fix_imports(cloner)
         return cloners
 
@@ -2075,9 +2191,7 @@ class MethodGenerator(object):
         else:
             method.add_line('return new String[] {')
             for key_stmt in self.gen.key_stmts:
-                method.add_line('"'.join([' ' * 4,
-                                          key_stmt.arg,
-                                          ',']))
+                method.add_line('    "%s",' % key_stmt.arg)
             method.add_line('};')
         return self.fix_imports(method)
 
@@ -2091,10 +2205,9 @@ class MethodGenerator(object):
         method = JavaMethod(modifiers=['public'], name='childrenNames')
         method.set_return_type('String[]')
         method.add_javadoc('@return An array with the identifiers of any children, in order.')
-        children = search(self.stmt, yangelement_stmts | leaf_stmts)
         method.add_line('return new String[] {')
-        for child in children:
-            method.add_line('"'.join([' ' * 4, child.arg, ',']))
+        for child in self.child_stmts:
+            method.add_line('    "%s",' % child.arg)
         method.add_line('};')
         return self.fix_imports(method)
 
@@ -2115,10 +2228,10 @@ class MethodGenerator(object):
             fields = OrderedSet()
         cond = ''
         for field in fields:  # could do reversed(fields) to preserve order
-            add_child.add_line(''.join([cond, 'if (child instanceof ',
-                    normalize(field), ') ', camelize(field), ' = (',
-                    normalize(field), ')child;']))
-            add_child.add_dependency(normalize(field))
+            field_class = normalize(field)
+            add_child.add_line('%sif (child instanceof %s) %s = (%s)child;' %
+                               (cond, field_class, camelize(field), field_class))
+            add_child.add_dependency(field_class)
             cond = 'else '
         return self.fix_imports(add_child)
 
@@ -2175,8 +2288,10 @@ class MethodGenerator(object):
         elif not (self.is_container or self.is_list):
             return None
         number_of_adders = 2
+        key_args = []
         if self.is_list and self.gen.is_config:
             number_of_adders = 4
+            key_args = [camelize(s.arg) + 'Value' for s in self.gen.key_stmts]
         res = [self._parent_template('add') for _ in range(number_of_adders)]
 
         for i, method in enumerate(res):
@@ -2191,29 +2306,29 @@ class MethodGenerator(object):
                 javadoc1.append(', with specified keys.')
                 if i == 2:
                     javadoc2.append('The keys are specified as strings.')
-                for key_stmt in self.gen.key_stmts:
-                    key_arg = camelize(key_stmt.arg) + 'Value'
+                for key_stmt, key_arg in zip(self.gen.key_stmts, key_args):
                     javadoc2.append(''.join(['@param ', key_arg,
                                              ' Key argument of child.']))
-                    param_type, _ = get_types(key_stmt, self.ctx)
                     if i == 2:
                         param_type = 'String'
+                    else:
+                        param_type, _ = get_types(key_stmt, self.ctx)
                     method.add_parameter(param_type, key_arg)
                 new_child = [self.n, ' ', self.n2, ' = new ', self.n, '(']
-                keys = [camelize(s.arg) + 'Value' for s in self.gen.key_stmts]
-                new_child.append(', '.join(keys))
+                new_child.append(', '.join(key_args))
                 new_child.append(');')
                 method.add_line(''.join(new_child))
             else:  # Create new, for subtree filter usage
                 javadoc1.append('.')
                 javadoc2.append('This method is used for creating subtree filters.')
-                method.add_line(' '.join([self.n, self.n2, '= new', self.n + '();']))
+                method.add_line('%(n)s %(n2)s = new %(n)s();' %
+                                {'n': self.n, 'n2': self.n2})
             method.add_javadoc(''.join(javadoc1))
             for javadoc in javadoc2:
                 method.add_javadoc(javadoc)
             method.add_javadoc('@return The added child.')
             if self.is_container:
-                method.add_line('this.' + self.n2 + ' = ' + self.n2 + ';')
+                method.add_line('this.%(n2)s = %(n2)s;' % {'n2': self.n2})
             if self.is_list and i in {1, 2} and len(res) == 4:
                 method.add_line('return ' + method.name + '(' + self.n2 + ');')
             else:
@@ -2246,19 +2361,16 @@ class MethodGenerator(object):
         if not(self.is_leaflist or self.is_list):
             return None
         res = JavaMethod(name=(self.n2 + 'Iterator'))
-        res.add_javadoc(''.join(['Iterator method for the ', self.stmt.keyword,
-                                 ' "', self.stmt.arg, '".']))
-        res.add_javadoc(''.join(['@return An iterator for the ',
-                                 self.stmt.keyword, '.']))
-        return_stmt = ['return new Element']
+        res.add_javadoc('Iterator method for the %s "%s".' %
+                        (self.stmt.keyword, self.stmt.arg))
+        res.add_javadoc('@return An iterator for the %s.' % self.stmt.keyword)
         if self.is_leaflist:
-            res.set_return_type('ElementLeafListValueIterator')
-            return_stmt.append('LeafListValue')
+            iterator = 'ElementLeafListValueIterator'
         else:  # List
-            res.set_return_type('ElementChildrenIterator')
-            return_stmt.append('Children')
-        return_stmt.extend(['Iterator(children, "', self.stmt.arg, '");'])
-        res.add_line(''.join(return_stmt))
+            iterator = 'ElementChildrenIterator'
+        res.set_return_type(iterator)
+        res.add_line('return new %s(children, "%s");' %
+                     (iterator, self.stmt.arg))
         return self.fix_imports(res)
 
     def parent_access_methods(self):
@@ -2289,65 +2401,49 @@ class LeafMethodGenerator(MethodGenerator):
     def getters(self):
         """get<Identifier>Value method generator."""
         assert self.is_leaf
+        keyword, arg = self.stmt.keyword, self.stmt.arg
+        jnc_type = self.type_str[0]
         method = JavaMethod()
-        method.set_return_type(self.type_str[0])
+        method.set_return_type(jnc_type)
         method.set_name('get' + self.n + 'Value')
         method.add_exception('JNCException')
 
         # YangEmpty type needs to be special treated
-        if self.type_str[0] == 'com.tailf.jnc.YangEmpty':
-            method.add_javadoc('Searches for ' + self.stmt.keyword + ' "' +
-                               self.stmt.arg + '".')
-            method.add_javadoc('@return A YangEmpty object if ' +
-                               self.stmt.keyword +
+        if jnc_type == 'com.tailf.jnc.YangEmpty':
+            method.add_javadoc('Searches for %s "%s".' % (keyword, arg))
+            method.add_javadoc('@return A YangEmpty object if ' + keyword +
                                ' exists; <code>null</code> otherwise.')
         else:
-            method.add_javadoc('Gets the value for child ' + self.stmt.keyword +
-                               ' "' + self.stmt.arg + '".')
-            method.add_javadoc('@return The value of the ' + self.stmt.keyword + '.')
+            method.add_javadoc('Gets the value for child %s "%s".' %
+                               (keyword, arg))
+            method.add_javadoc('@return The value of the ' + keyword + '.')
 
         # Leaves with a default value returns it instead of null
         if self.default:
             method.add_line(''.join([method.return_type, ' ', self.n2, ' = (',
                                      method.return_type, ')getValue("',
-                                     self.stmt.arg, '");']))
+                                     arg, '");']))
             method.add_line('if (' + self.n2 + ' == null) {')
             newValue = ['    ', self.n2, ' = new ', method.return_type, '("',
                         self.default_value]
-            if self.type_str[0] == 'com.tailf.jnc.YangUnion':
+            if jnc_type == 'com.tailf.jnc.YangUnion':
                 newValue.append('", new String[] {  // default\n')
                 for type_stmt in search(self.base_type, 'type'):
                     member_type, _ = get_types(type_stmt, self.ctx)
-                    newValue.append(' ' * 16 + '"' + member_type + '",\n')
-                newValue.append(' ' * 12 + '});')
-            elif self.type_str[0] == 'com.tailf.jnc.YangEnumeration':
+                    newValue.append('                "%s",\n' % member_type)
+                newValue.append('            });')
+            elif jnc_type == 'com.tailf.jnc.YangEnumeration':
                 newValue.append('", new String[] {  // default\n')
                 for enum in search(self.base_type, 'enum'):
-                    newValue.append(' ' * 16 + '"' + enum.arg + '",\n')
-                newValue.append(' ' * 12 + '});')
-            elif self.type_str[0] == 'com.tailf.jnc.YangBits':
+                    newValue.append('                "%s",\n' % enum.arg)
+                newValue.append('            });')
+            elif jnc_type == 'com.tailf.jnc.YangBits':
                 newValue.append('",  // default')
                 method.add_line(''.join(newValue))
-                mask = 0
-                smap = ['        new String[] {']
-                imap = ['        new int[] {']
-                position = 0
-                for bit in search(self.base_type, 'bit'):
-                    smap.extend(['"', bit.arg, '", '])
-                    pos_stmt = search_one(bit, 'position')
-                    if pos_stmt:
-                        position = int(pos_stmt.arg)
-                    imap.extend([str(position), ', '])
-                    mask += 1 << position
-                    position += 1
-                smap.append('},')
-                imap.append('}')
-                line = [' ' * 8, 'new BigInteger("', str(mask), '"),']
-                method.add_line(''.join(line))
-                method.add_line(''.join(smap))
-                method.add_line(''.join(imap))
+                for line in bits_arguments(self.base_type, '        '):
+                    method.add_line(line)
                 newValue = ['    );']
-            elif self.type_str[0] == 'com.tailf.jnc.YangDecimal64':
+            elif jnc_type == 'com.tailf.jnc.YangDecimal64':
                 fraction_digits = search_one(self.base_type, 'fraction-digits')
                 newValue.extend(['", ', fraction_digits.arg, ');  // default'])
             else:
@@ -2357,20 +2453,22 @@ class LeafMethodGenerator(MethodGenerator):
             method.add_line('return ' + self.n2 + ';')
         else:
             method.add_line(''.join(['return (', method.return_type,
-                                     ')getValue("', self.stmt.arg, '");']))
+                                     ')getValue("', arg, '");']))
         return [self.fix_imports(method, child=True)]
 
     def setters(self):
         name = 'set' + self.n + 'Value'
         num_methods = 2 + (not self.is_string)
         value_type = self.type_str[0]  # JNC type
+        keyword, arg = self.stmt.keyword, self.stmt.arg
         res = [JavaMethod(name=name) for _ in range(num_methods)]
+        javadoc = 'Sets the value for child %s "%s",' % (keyword, arg)
+        value_name = self.n2 + 'Value'
 
         for i, method in enumerate(res):
-            param_names = [self.n2 + 'Value']
+            param_names = [value_name]
             method.add_exception('JNCException')
-            method.add_javadoc('Sets the value for child ' + self.stmt.keyword +
-                               ' "' + self.stmt.arg + '",')
+            method.add_javadoc(javadoc)
             if i == 0:
                 param_types = [value_type]
                 if not self.is_typedef:
@@ -2379,13 +2477,13 @@ class LeafMethodGenerator(MethodGenerator):
                     method.add_javadoc('using a JNC type value.')
                 method.add_javadoc(' '.join(['@param', param_names[0],
                                              'The value to set.']))
-                method.add_line(''.join(['set', normalize(self.stmt.keyword),
+                method.add_line(''.join(['set', normalize(keyword),
                                          'Value(', self.root, '.NAMESPACE,']))
                 method.add_dependency(self.root)
-                method.add_line('    "' + self.stmt.arg + '",')
+                method.add_line('    "%s",' % arg)
                 method.add_line('    ' + param_names[0] + ',')
                 method.add_line('    childrenNames());')
-            elif self.type_str[0] == 'com.tailf.jnc.YangEmpty':
+            elif value_type == 'com.tailf.jnc.YangEmpty':
                 method.add_javadoc('by instantiating it (value n/a).')
                 param_types = []  # Add parameter here to get correct javadoc
                 method.add_parameter('String', param_names[0])
@@ -2403,42 +2501,26 @@ class LeafMethodGenerator(MethodGenerator):
                     param_types = ['String']
                     method.add_javadoc('using a String value.')
 
-                if self.type_str[0] == 'com.tailf.jnc.YangUnion':
+                if value_type == 'com.tailf.jnc.YangUnion':
                     line.append(', new String[] {')
                     method.add_line(''.join(line))
                     for type_stmt in search(self.base_type, 'type'):
                         member_type, _ = get_types(type_stmt, self.ctx)
                         method.add_line('     "' + member_type + '",')
                     line = ['}']
-                elif self.type_str[0] == 'com.tailf.jnc.YangEnumeration':
+                elif value_type == 'com.tailf.jnc.YangEnumeration':
                     line.append(', new String[] {')
                     method.add_line(''.join(line))
                     for enum in search(self.base_type, 'enum'):
                         method.add_line('     "' + enum.arg + '",')
                     line = ['}']
-                elif self.type_str[0] == 'com.tailf.jnc.YangBits':
+                elif value_type == 'com.tailf.jnc.YangBits':
                     line.append(',')
                     method.add_line(''.join(line))
-                    mask = 0
-                    smap = ['    new String[] {']
-                    imap = ['    new int[] {']
-                    position = 0
-                    for bit in search(self.base_type, 'bit'):
-                        smap.extend(['"', bit.arg, '", '])
-                        pos_stmt = search_one(bit, 'position')
-                        if pos_stmt:
-                            position = int(pos_stmt.arg)
-                        imap.extend([str(position), ', '])
-                        mask += 1 << position
-                        position += 1
-                    smap.append('},')
-                    imap.append('}')
-                    method.add_line(''.join(['    new BigInteger("',
-                                                  str(mask), '"),']))
-                    method.add_line(''.join(smap))
-                    method.add_line(''.join(imap))
+                    for bits_line in bits_arguments(self.base_type, '    '):
+                        method.add_line(bits_line)
                     line = []
-                elif self.type_str[0] == 'com.tailf.jnc.YangDecimal64':
+                elif value_type == 'com.tailf.jnc.YangDecimal64':
                     frac_digits = search_one(self.base_type, 'fraction-digits')
                     line.extend([', ', frac_digits.arg])
 
@@ -2455,12 +2537,11 @@ class LeafMethodGenerator(MethodGenerator):
     def unsetter(self):
         """unset<Identifier>Value method generator"""
         method = JavaMethod()
-        method.add_javadoc(' '.join(['Unsets the value for child',
-                                     self.stmt.keyword,
-                                     '"' + self.stmt.arg + '".']))
+        method.add_javadoc('Unsets the value for child %s "%s".' %
+                           (self.stmt.keyword, self.stmt.arg))
         method.set_name('unset' + self.n + 'Value')
         method.add_exception('JNCException')
-        method.add_line('delete("' + self.stmt.arg + '");')
+        method.add_line('delete("%s");' % self.stmt.arg)
         return self.fix_imports(method, child=True)
 
     def _parent_method(self, method_type):
@@ -2473,21 +2554,21 @@ class LeafMethodGenerator(MethodGenerator):
         """
         assert self.is_leaflist
         res = [self._parent_template(method_type) for _ in range(2)]
+        javadoc = ''.join([method_type.capitalize(), 's ', self.stmt.keyword,
+                           ' entry "', self.n2, '".'])
+        param_javadoc = ''.join(['@param ', self.n2, 'Value Value to ',
+                                 method_type, '.'])
 
         for i, method in enumerate(res):
-            method.add_javadoc(''.join([method_type.capitalize(), 's ',
-                                        self.stmt.keyword, ' entry "',
-                                        self.n2, '".']))
+            method.add_javadoc(javadoc)
             if i == 1:
                 method.add_javadoc('The value is specified as a string.')
-            method.add_javadoc(''.join(['@param ', self.n2, 'Value Value to ',
-                                     method_type, '.']))
+            method.add_javadoc(param_javadoc)
             param_type = 'String'
             if i == 0:
                 param_type = self.type_str[0]
             method.add_parameter(param_type, self.n2 + 'Value')
-            path = ['String path = "', self.n2, '[', self.n2, 'Value]";']
-            method.add_line(''.join(path))
+            method.add_line('String path = "%s[%sValue]";' % (self.n2, self.n2))
             if method_type == 'delete':
                 method.add_line('delete(path);')
             else:  # get
@@ -2507,44 +2588,43 @@ class LeafMethodGenerator(MethodGenerator):
         method = JavaMethod(name=('add' + self.n))
         method.add_exception('JNCException')
         method.add_javadoc('This method is used for creating a subtree filter.')
-        method.add_javadoc(''.join(['The added "', self.stmt.arg, '" ',
-                                    self.stmt.keyword,
-                                    ' will not have a value.']))
-        method.add_line('set' + normalize(self.stmt.keyword) + 'Value(' +
-                        self.root + '.NAMESPACE,')
-        method.add_line('    "' + self.stmt.arg + '",')
+        method.add_javadoc('The added "%s" %s will not have a value.' %
+                           (self.stmt.arg, self.stmt.keyword))
+        method.add_line('set%sValue(%s.NAMESPACE,' %
+                        (normalize(self.stmt.keyword), self.root))
+        method.add_line('    "%s",' % self.stmt.arg)
         method.add_line('    null,')
         method.add_line('    childrenNames());')
         return self.fix_imports(method, child=True)
 
     def markers(self):
-        res = []
-        for op in ('replace', 'merge', 'create', 'delete'):
-            res.append(self.mark(op))
-        return res
+        return [self.mark(op) for op in mark_ops]
 
     def mark(self, op):
-        assert op in ('replace', 'merge', 'create', 'delete')
+        assert op in mark_ops
         mark_methods = [JavaMethod()]
         if not self.is_string and self.is_leaflist:
             mark_methods.append(JavaMethod())
+        path = [self.n2]
+        if self.is_leaflist:
+            path.extend(['[name=\'" + ', self.n2, 'Value + "\']'])
+        path = ''.join(path)
+        mark_javadoc = ''.join(['Marks the ', self.stmt.keyword, ' "',
+                                self.stmt.arg, '" with operation "', op, '".'])
+        op_name = normalize(op)
         for i, mark_method in enumerate(mark_methods):
-            mark_method.set_name('mark' + self.n + normalize(op))
+            mark_method.set_name('mark' + self.n + op_name)
             mark_method.add_exception('JNCException')
-            path = self.n2
-            mark_method.add_javadoc(''.join(['Marks the ', self.stmt.keyword,
-                                             ' "', self.stmt.arg,
-                                             '" with operation "', op, '".']))
+            mark_method.add_javadoc(mark_javadoc)
             if self.is_leaflist:
-                path += '[name=\'" + ' + self.n2 + 'Value + "\']'
-                javadoc = '@param ' + self.n2 + 'Value The value to mark'
+                javadoc = ['@param ', self.n2, 'Value The value to mark']
                 param_type = self.type_str[0]
                 if i == 1:
-                    javadoc += ', given as a String'
+                    javadoc.append(', given as a String')
                     param_type = 'String'
                 mark_method.add_parameter(param_type, self.n2 + 'Value')
-                mark_method.add_javadoc(javadoc)
-            mark_method.add_line('markLeaf' + normalize(op) + '("' + path + '");')
+                mark_method.add_javadoc(''.join(javadoc))
+            mark_method.add_line('markLeaf%s("%s");' % (op_name, path))
             self.fix_imports(mark_method, child=True)
         return mark_methods
 
@@ -2625,24 +2705,8 @@ class TypedefMethodGenerator(MethodGenerator):
             elif self.jnc_type == 'com.tailf.jnc.YangBits':
                 constructor.body = []
                 constructor.add_line('super(value,')
-                mask = 0
-                smap = ['    new String[] {']
-                imap = ['    new int[] {']
-                position = 0
-                for bit in search(self.type, 'bit'):
-                    smap.extend(['"', bit.arg, '", '])
-                    pos_stmt = search_one(bit, 'position')
-                    if pos_stmt:
-                        position = int(pos_stmt.arg)
-                    imap.extend([str(position), ', '])
-                    mask += 1 << position
-                    position += 1
-                smap.append('},')
-                imap.append('}')
-                constructor.add_line(''.join(['    new BigInteger("',
-                                              str(mask), '"),']))
-                constructor.add_line(''.join(smap))
-                constructor.add_line(''.join(imap))
+                for line in bits_arguments(self.type, '    '):
+                    constructor.add_line(line)
                 constructor.add_line(');')
             
             # Add call to check method if type has constraints
@@ -2761,11 +2825,11 @@ class ListMethodGenerator(MethodGenerator):
             except AttributeError:
                 self.is_config = False  # is_config produced wrong value
 
-        findkey = lambda k: search_one(self.stmt, 'leaf', arg=k)
-        self.key_stmts = [findkey(k) for k in self.keys]
+        self.key_stmts = [search_one(self.stmt, 'leaf', arg=k)
+                          for k in self.keys]
 
-        notstring = lambda k: get_types(k, ctx)[1] != 'String'
-        self.is_string = not all(notstring(k) for k in  self.key_stmts)
+        self.is_string = any(get_types(k, ctx)[1] == 'String'
+                             for k in self.key_stmts)
 
     def value_constructors(self):
         """Returns a list of constructors for configuration data lists"""
@@ -2822,25 +2886,9 @@ class ListMethodGenerator(MethodGenerator):
                     elif jnc == 'YangBits':
                         setValue.append(',')
                         constructor.add_line(''.join(setValue))
-                        mask = 0
-                        smap = ['    new String[] {']
-                        imap = ['    new int[] {']
-                        position = 0
-                        for bit in search(key_type, 'bit'):
-                            smap.extend(['"', bit.arg, '", '])
-                            pos_stmt = search_one(bit, 'position')
-                            if pos_stmt:
-                                position = int(pos_stmt.arg)
-                            imap.extend([str(position), ', '])
-                            mask += 1 << position
-                            position += 1
-                        smap.append('},')
-                        imap.append('}')
-                        constructor.add_line(''.join(['    new BigInteger("',
-                                                      str(mask), '"),']))
+                        for line in bits_arguments(key_type, '    '):
+                            constructor.add_line(line)
                         constructor.add_dependency('BigInteger')
-                        constructor.add_line(''.join(smap))
-                        constructor.add_line(''.join(imap))
                         constructor.add_line('));')
                     elif jnc == 'YangDecimal64':
                         frac_digits = search_one(key_type, 'fraction-digits')
@@ -2887,9 +2935,10 @@ class ListMethodGenerator(MethodGenerator):
         """
         num_methods = 2 if self.is_config else 1
         res = [self._parent_template(method_type) for _ in range(num_methods)]
+        verb = method_type.capitalize()
 
         for i, method in enumerate(res):
-            javadoc1 = [method_type.capitalize(), 's ', self.stmt.keyword,
+            javadoc1 = [verb, 's ', self.stmt.keyword,
                         ' entry "', self.n2, '", with specified keys.']
             javadoc2 = []
             path = ['String path = "', self.stmt.arg]
@@ -2904,7 +2953,8 @@ class ListMethodGenerator(MethodGenerator):
                 if i == 0:
                     param_type, _ = get_types(key, self.ctx)
                 method.add_parameter(param_type, key_arg + 'Value')
-                path.extend(['[', key_arg, '=\'" + ',key_arg, 'Value + "\']'])
+                path.append('[%(key)s=\'" + %(key)sValue + "\']' %
+                            {'key': key_arg})
             path.append('";')
 
             method.add_javadoc(''.join(javadoc1))
@@ -2961,6 +3011,8 @@ class OrderedSet(collections.MutableSet):
 
     """
 
+    ITEM, PREV, NEXT = 0, 1, 2  # Indices of the linked list node fields
+
     def __init__(self, iterable=None):
         """Creates an ordered set.
 
@@ -2969,7 +3021,6 @@ class OrderedSet(collections.MutableSet):
                     used, the set is initialized as empty.
 
         """
-        self.ITEM, self.PREV, self.NEXT = list(range(3))
         self.end = end = []
         end += [None, end, end]         # sentinel node for doubly linked list
         self.map = {}                   # value --> [value, prev, next]
@@ -3045,9 +3096,7 @@ class OrderedSet(collections.MutableSet):
 
     def as_sorted_list(self):
         """Returns a sorted list with the items in this set"""
-        res = [x for x in self]
-        res.sort()
-        return res
+        return sorted(self)
 
     def __repr__(self):
         """Returns a string representing this set. If empty, the string